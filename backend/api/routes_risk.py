@@ -15,11 +15,26 @@ router = APIRouter(prefix="/risk", tags=["risk"])
 
 logger = get_logger(__name__)
 _gateway: ExchangeGateway | None = None
+# (venue, symbol, timeframe, limit) -> (expires_at_ms, candles)
+_klines_cache: dict[tuple[str, str, str, int], tuple[int, List[Any]]] = {}
+# Upper bound on cached windows; expired ones are also dropped whenever a new window is stored.
+_KLINES_CACHE_MAX_ENTRIES = 64
+_TIMEFRAME_MS: dict[str, int] = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+}
 
 
 def configure_gateway(gateway: ExchangeGateway) -> None:
     global _gateway
     _gateway = gateway
+    _klines_cache.clear()
 
 
 def get_gateway() -> ExchangeGateway:
@@ -37,6 +52,9 @@ def _sort_candles(candles: List[Any]) -> List[Any]:
 
 def _timeframe_to_ms(timeframe: str) -> int:
     value = (timeframe or "").strip().lower()
+    known = _TIMEFRAME_MS.get(value)
+    if known is not None:
+        return known
     match = re.fullmatch(r"(\d+)([mh])", value)
     if not match:
         raise ValueError(f"Unsupported ATR timeframe '{timeframe}'.")
@@ -61,12 +79,41 @@ def _drop_incomplete_tail(candles: List[Any], timeframe: str) -> List[Any]:
         open_ms = int(open_ts)
     except (TypeError, ValueError):
         return candles
-    now_ms = int(time.time() * 1000)
+    now_ms = time.time_ns() // 1_000_000
     if open_ms + interval_ms > now_ms:
         return candles[:-1]
     return candles
 
 
+def _store_klines(key: tuple[str, str, str, int], expires_ms: int, candles: List[Any], now_ms: int) -> None:
+    for stale_key in [k for k, (expiry, _) in _klines_cache.items() if expiry <= now_ms]:
+        del _klines_cache[stale_key]
+    # Re-insert at the end so the dict stays in least-recently-stored order for eviction.
+    _klines_cache.pop(key, None)
+    _klines_cache[key] = (expires_ms, candles)
+    while len(_klines_cache) > _KLINES_CACHE_MAX_ENTRIES:
+        del _klines_cache[next(iter(_klines_cache))]
+
+
+async def _fetch_klines_cached(gateway: ExchangeGateway, symbol: str, timeframe: str, limit: int) -> List[Any]:
+    # ATR only reads closed candles, so a window stays valid until the current candle closes.
+    # Windows are sorted once here so cache hits skip re-sorting.
+    try:
+        interval_ms = _timeframe_to_ms(timeframe)
+    except ValueError:
+        return _sort_candles(await gateway.fetch_klines(symbol, timeframe, limit))
+    venue = str(getattr(gateway, "venue", "") or "").strip().lower()
+    key = (venue, symbol, timeframe, limit)
+    now_ms = time.time_ns() // 1_000_000
+    cached = _klines_cache.get(key)
+    if cached is not None and now_ms < cached[0]:
+        return cached[1]
+    candles = _sort_candles(await gateway.fetch_klines(symbol, timeframe, limit))
+    if candles:
+        _store_klines(key, (now_ms // interval_ms + 1) * interval_ms, candles, now_ms)
+    return candles
+
+
 def _atr_fetch_limit(gateway: ExchangeGateway, period: int, timeframe: str) -> int:
     base = max(period * 20, 200)
     venue = str(getattr(gateway, "venue", "") or "").strip().lower()
@@ -111,7 +158,8 @@ async def atr_stop(
     # Cap per venue where needed for endpoint stability.
     limit = _atr_fetch_limit(gateway, config.period, config.timeframe)
     try:
-        candles = await gateway.fetch_klines(
+        candles = await _fetch_klines_cached(
+            gateway,
             request.symbol,
             config.timeframe,
             limit,
@@ -134,7 +182,7 @@ async def atr_stop(
             },
         )
 
-    candles = _drop_incomplete_tail(_sort_candles(candles), config.timeframe)
+    candles = _drop_incomplete_tail(candles, config.timeframe)
     available_candles = len(candles)
     if available_candles == 0:
         return error_response(
@@ -15,11 +15,16 @@ from backend.core.logging import get_logger
 from backend.exchange.apex_client import ApexClient
 
 logger = get_logger(__name__)
+_TPSL_TYPE_PREFIXES = ("STOP", "TAKE_PROFIT")
 
 
 class ExchangeGateway:
     """Wrapper around ApeX Omni SDK with cached configs and basic helpers."""
 
+    _CANCELED_ORDER_STATUSES = frozenset({"canceled", "cancelled"})
+    _CLOSED_ORDER_STATUSES = _CANCELED_ORDER_STATUSES | {"filled"}
+    _INACTIVE_ORDER_STATUSES = _CLOSED_ORDER_STATUSES | {"triggered"}
+
     def __init__(self, settings: Settings, client: Optional[Any] = None, public_client: Optional[Any] = None) -> None:
         self.settings = settings
         self.venue = "apex"
@@ -759,16 +764,16 @@ class ExchangeGateway:
                     for o in orders_raw
                     if isinstance(o, dict)
                     and o.get("isPositionTpsl")
-                    and str(o.get("type") or "").upper().startswith(("STOP", "TAKE_PROFIT"))
-                    and str(o.get("status") or "").lower() not in {"canceled", "cancelled", "filled", "triggered"}
+                    and str(o.get("type") or "").upper().startswith(_TPSL_TYPE_PREFIXES)
+                    and str(o.get("status") or "").lower() not in self._INACTIVE_ORDER_STATUSES
                 ]
                 canceled_tpsl_payload = [
                     o
                     for o in orders_raw
                     if isinstance(o, dict)
                     and o.get("isPositionTpsl")
-                    and str(o.get("type") or "").upper().startswith(("STOP", "TAKE_PROFIT"))
-                    and str(o.get("status") or "").lower() in {"canceled", "cancelled"}
+                    and str(o.get("type") or "").upper().startswith(_TPSL_TYPE_PREFIXES)
+                    and str(o.get("status") or "").lower() in self._CANCELED_ORDER_STATUSES
                 ]
 
             if position_tpsl_payload:
@@ -782,7 +787,7 @@ class ExchangeGateway:
                     o
                     for o in (self._ws_orders_tpsl or [])
                     if isinstance(o, dict)
-                    and str(o.get("status") or "").lower() not in {"canceled", "cancelled", "filled", "triggered"}
+                    and str(o.get("status") or "").lower() not in self._INACTIVE_ORDER_STATUSES
                 ]
                 combined = {_order_key(o): o for o in existing_active}
                 for o in position_tpsl_payload:
@@ -931,7 +936,7 @@ class ExchangeGateway:
             if self._is_tpsl_order_payload(o):
                 continue
             status = str(o.get("status") or o.get("orderStatus") or "").lower()
-            if status in {"canceled", "cancelled", "filled"} or "cancel" in status:
+            if status in self._CLOSED_ORDER_STATUSES or "cancel" in status:
                 continue
             key = (
                 o.get("orderId")
@@ -1846,7 +1851,7 @@ class ExchangeGateway:
                         for o in orders
                         if isinstance(o, dict)
                         and self._is_tpsl_order_payload(o)
-                        and str(o.get("status") or "").lower() not in {"canceled", "cancelled", "filled", "triggered"}
+                        and str(o.get("status") or "").lower() not in self._INACTIVE_ORDER_STATUSES
                     ]
                 # logger.info(
                 #     "account_snapshot_refreshed",
@@ -2118,7 +2123,7 @@ class ExchangeGateway:
                 if symbol_key and sym != symbol_key:
                     continue
                 status_raw = str(o.get("status") or o.get("orderStatus") or "").lower()
-                if status_raw in {"canceled", "cancelled", "filled", "triggered"} or "cancel" in status_raw:
+                if status_raw in self._INACTIVE_ORDER_STATUSES or "cancel" in status_raw:
                     continue
                 if not o.get("isPositionTpsl"):
                     continue
@@ -2290,7 +2295,7 @@ class ExchangeGateway:
                     if isinstance(o, dict)
                     and self._normalize_symbol_value(o.get("symbol") or o.get("market")) == symbol_key
                     and o.get("isPositionTpsl")
-                    and str(o.get("status") or "").lower() not in {"canceled", "cancelled", "filled", "triggered"}
+                    and str(o.get("status") or "").lower() not in self._INACTIVE_ORDER_STATUSES
                 ]
             if cancel_tp and not cancel_sl:
                 refreshed = [t for t in refreshed if str(t.get("type") or "").upper().startswith("TAKE_PROFIT")]
@@ -2476,7 +2481,7 @@ class ExchangeGateway:
         if not isinstance(order, dict):
             return False
         order_type = (order.get("type") or order.get("orderType") or order.get("order_type") or "").upper()
-        if not (order_type.startswith("STOP") or order_type.startswith("TAKE_PROFIT")):
+        if not order_type.startswith(_TPSL_TYPE_PREFIXES):
             return False
         if bool(order.get("isPositionTpsl")):
             return True
@@ -3,6 +3,7 @@ import random
 import time
 from collections import defaultdict, deque
 from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 from eth_account import Account
@@ -28,14 +29,16 @@ class HyperliquidGateway:
         "12h": 43_200_000,
         "1d": 86_400_000,
     }
-    _TERMINAL_ORDER_STATUSES = {
-        "canceled",
-        "cancelled",
-        "filled",
-        "rejected",
-        "margin canceled",
-        "margin cancelled",
-    }
+    _TERMINAL_ORDER_STATUSES = frozenset(
+        {
+            "canceled",
+            "cancelled",
+            "filled",
+            "rejected",
+            "margin canceled",
+            "margin cancelled",
+        }
+    )
 
     def __init__(
         self,
@@ -94,6 +97,7 @@ class HyperliquidGateway:
         self._last_ws_reconnect_ts = 0.0
         self._last_order_account_refresh_ts = 0.0
         self._order_account_refresh_min_gap_seconds = 1.0
+        self._order_account_refresh_pending = False
         self._pending_submitted_orders: dict[str, dict[str, Any]] = {}
         self._ws_orders: dict[str, dict[str, Any]] = {}
         self._ws_orders_raw: list[dict[str, Any]] = []
@@ -215,16 +219,28 @@ class HyperliquidGateway:
 
     @classmethod
     def _is_terminal_status(cls, status: Any) -> bool:
-        text = str(status or "").strip().lower()
+        return cls._is_terminal_status_text(str(status or ""))
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _is_terminal_status_text(raw: str) -> bool:
+        # Order statuses come from a small venue vocabulary, so memoize per raw string.
+        text = raw.strip().lower()
         if not text:
             return False
-        if text in cls._TERMINAL_ORDER_STATUSES:
+        if text in HyperliquidGateway._TERMINAL_ORDER_STATUSES:
             return True
         return "cancel" in text
 
+    @classmethod
+    def _normalize_order_type(cls, raw_type: Any) -> str:
+        # Dict-shaped order types stringify with per-order trigger prices; the bounded cache just cycles them out.
+        return cls._order_type_from_text(str(raw_type or ""))
+
     @staticmethod
-    def _normalize_order_type(raw_type: Any) -> str:
-        text = str(raw_type or "").strip().upper().replace("-", " ").replace("_", " ")
+    @lru_cache(maxsize=256)
+    def _order_type_from_text(raw: str) -> str:
+        text = raw.strip().upper().replace("-", " ").replace("_", " ")
         if "TAKE" in text and "PROFIT" in text:
             return "TAKE_PROFIT_MARKET"
         if "STOP" in text:
@@ -329,13 +345,25 @@ class HyperliquidGateway:
             except Exception:
                 continue
 
-    def _schedule_coro(self, coro_factory) -> None:
+    def _schedule_coro(self, coro_factory, on_done=None) -> bool:
         if not self._loop:
-            return
+            return False
+
+        def _spawn() -> None:
+            try:
+                task = asyncio.create_task(coro_factory())
+            except Exception:
+                if on_done is not None:
+                    on_done(None)
+                return
+            if on_done is not None:
+                task.add_done_callback(on_done)
+
         try:
-            self._loop.call_soon_threadsafe(lambda: asyncio.create_task(coro_factory()))
+            self._loop.call_soon_threadsafe(_spawn)
         except Exception:
-            return
+            return False
+        return True
 
     async def _refresh_account_summary_now(self) -> None:
         try:
@@ -344,13 +372,23 @@ class HyperliquidGateway:
         except Exception:
             return
 
+    def _clear_account_refresh_pending(self, _task: Optional[asyncio.Task] = None) -> None:
+        # Runs on task completion, including cancellation before the first step.
+        self._order_account_refresh_pending = False
+
     def _schedule_account_summary_refresh(self) -> None:
+        # Coalesce bursts: skip while a refresh is queued/in flight or inside the min gap.
+        if self._order_account_refresh_pending:
+            return
         now = time.time()
         min_gap = max(0.0, float(self._order_account_refresh_min_gap_seconds or 0.0))
         if min_gap > 0 and (now - self._last_order_account_refresh_ts) < min_gap:
             return
         self._last_order_account_refresh_ts = now
-        self._schedule_coro(self._refresh_account_summary_now)
+        # Set before scheduling: the WS thread may still be here when the loop finishes the refresh.
+        self._order_account_refresh_pending = True
+        if not self._schedule_coro(self._refresh_account_summary_now, on_done=self._clear_account_refresh_pending):
+            self._order_account_refresh_pending = False
 
     @staticmethod
     def _extract_statuses(response: Any) -> list[dict[str, Any]]:
@@ -928,6 +966,7 @@ class HyperliquidGateway:
         self._ws_orders_raw = []
         self._ws_positions.clear()
         self._pending_submitted_orders.clear()
+        self._order_account_refresh_pending = False
         self._last_private_ws_event_ts = 0.0
         self._last_ws_reconnect_ts = 0.0
 
@@ -1062,7 +1101,7 @@ class HyperliquidGateway:
         if interval not in self._TIMEFRAME_MS:
             raise ValueError(f"Unsupported timeframe '{timeframe}' for Hyperliquid candles.")
         safe_limit = max(1, min(int(limit), 500))
-        now_ms = int(time.time() * 1000)
+        now_ms = time.time_ns() // 1_000_000
         interval_ms = self._TIMEFRAME_MS[interval]
         start_ms = now_ms - (safe_limit + 2) * interval_ms
         rows = await asyncio.to_thread(
@@ -12,6 +12,7 @@ logger = get_logger(__name__)
 
 
 CandlePayload = Mapping[str, Any]
+_MISSING = object()
 
 
 @dataclass(frozen=True)
@@ -60,7 +61,10 @@ def calculate_atr(symbol: str, timeframe: str, candles: Sequence[CandlePayload],
         )
         return None
 
-    true_ranges: list[float] = []
+    # Single pass: the first `period` true ranges seed Wilder's SMA, the rest feed
+    # the recursive smoothing directly instead of being buffered.
+    seed: list[float] = []
+    atr: Optional[float] = None
     prev_close: Optional[float] = None
 
     for candle in candles:
@@ -68,7 +72,7 @@ def calculate_atr(symbol: str, timeframe: str, candles: Sequence[CandlePayload],
         low = _extract_price(candle, "low", "Low", "l")
         close = _extract_price(candle, "close", "Close", "c")
 
-        if None in (high, low, close):
+        if high is None or low is None or close is None:
             continue
 
         if prev_close is None:
@@ -78,20 +82,20 @@ def calculate_atr(symbol: str, timeframe: str, candles: Sequence[CandlePayload],
 
         if tr < 0:
             continue
-        true_ranges.append(tr)
         prev_close = close
+        if atr is not None:
+            atr = ((atr * (period - 1)) + tr) / period
+            continue
+        seed.append(tr)
+        if len(seed) == period:
+            atr = sum(seed) / period
 
-    if len(true_ranges) < period:
+    if atr is None:
         logger.warning(
             "atr_tr_gap",
-            extra={"symbol": symbol, "timeframe": timeframe, "valid_tr": len(true_ranges), "period": period},
+            extra={"symbol": symbol, "timeframe": timeframe, "valid_tr": len(seed), "period": period},
         )
         return None
-
-    # Wilder's smoothing: SMA for first period, then recursive smoothing for the rest.
-    atr = sum(true_ranges[:period]) / period
-    for tr in true_ranges[period:]:
-        atr = ((atr * (period - 1)) + tr) / period
     return atr
 
 
@@ -137,14 +141,15 @@ def default_stop_price(entry_price: float, side: str, atr_value: float, multipli
 
 def _extract_price(candle: CandlePayload, *keys: str) -> Optional[float]:
     for key in keys:
-        if key in candle:
-            value = candle[key]
-            if value is None:
-                return None
-            try:
-                return float(value)
-            except (TypeError, ValueError):
-                return None
+        value = candle.get(key, _MISSING)
+        if value is _MISSING:
+            continue
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
     return None
 
 
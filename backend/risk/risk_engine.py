@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PositionSizingResult:
     side: str
     size: float
@@ -53,7 +53,7 @@ def calculate_position_size(
     tick = float(symbol_config.get("tickSize", 0) or 0)
     step = float(symbol_config.get("stepSize", 0) or 0)
     min_size = float(symbol_config.get("minOrderSize", 0) or 0)
-    max_size = float(symbol_config.get("maxOrderSize", float("inf")) or float("inf"))
+    max_size = float(symbol_config.get("maxOrderSize") or math.inf)
     max_leverage = symbol_config.get("maxLeverage")
     max_leverage = float(max_leverage) if max_leverage not in (None, 0) else None
 
@@ -95,11 +95,8 @@ def calculate_position_size(
     warnings: List[str] = []
 
     if max_leverage is not None and max_leverage > 0:
-        leverage_base_capital = (
-            float(leverage_capital)
-            if leverage_capital is not None and float(leverage_capital) > 0
-            else float(equity)
-        )
+        leverage_capital_value = float(leverage_capital) if leverage_capital is not None else 0.0
+        leverage_base_capital = leverage_capital_value if leverage_capital_value > 0 else float(equity)
         max_notional = leverage_base_capital * max_leverage
         if notional > max_notional:
             allowed = max_notional / entry_price_rounded
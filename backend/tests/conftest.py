@@ -0,0 +1,38 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # uvloop ships with uvicorn[standard]; fall back to the stdlib loop
+    uvloop = None
+
+
+def pytest_configure(config):
+    # backend/tests/conftest.py -> repo root; only resolve symlinks when the plain
+    # parent walk does not land on the checkout. Runs once per process.
+    root = Path(__file__).parents[2]
+    if not (root / "backend").is_dir():
+        root = Path(__file__).resolve().parents[2]
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+
+
+@pytest.fixture(scope="session")
+def _session_loop():
+    # Not named event_loop: pytest-asyncio reserves that fixture name.
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    asyncio.set_event_loop(None)
+    loop.close()
+
+
+@pytest.fixture
+def run(_session_loop):
+    """Drive a coroutine to completion on the shared session loop."""
+    # Re-install it: module-local runners elsewhere in the suite reset the current loop.
+    asyncio.set_event_loop(_session_loop)
+    return _session_loop.run_until_complete
@@ -1,11 +1,4 @@
-import sys
-from pathlib import Path
-
-ROOT = Path(__file__).resolve().parents[2]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
-from backend.exchange.apex_client import ApexClient  # noqa: E402
+from backend.exchange.apex_client import ApexClient
 
 
 class FakeSettings:
@@ -1,15 +1,30 @@
 import asyncio
-import sys
+import functools
 import time
-from pathlib import Path
 import pytest
 
-ROOT = Path(__file__).resolve().parents[2]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+from backend.exchange.exchange_gateway import ExchangeGateway
+from backend.exchange.hyperliquid_gateway import HyperliquidGateway
 
-from backend.exchange.exchange_gateway import ExchangeGateway  # noqa: E402
-from backend.exchange.hyperliquid_gateway import HyperliquidGateway  # noqa: E402
+APPROX = functools.partial(pytest.approx, rel=1e-9)
+_DISCONNECT = RuntimeError("Connection aborted: Remote end closed connection without response")
+_WS_ORDER_BASE = {
+    "oid": 0,
+    "coin": "BTC",
+    "side": "B",
+    "sz": "0.01",
+    "limitPx": "41000",
+    "reduceOnly": False,
+    "orderType": "Limit",
+}
+
+
+def _ws_order_row(oid: int, status: str, **overrides) -> dict:
+    return {"order": {**_WS_ORDER_BASE, "oid": oid, **overrides}, "status": status}
+
+
+def _make_ws_update(*rows: dict) -> dict:
+    return {"channel": "orderUpdates", "data": list(rows)}
 
 
 @pytest.fixture(autouse=True)
@@ -601,7 +616,7 @@ def test_hyperliquid_private_account_orders_positions():
     assert summary["available_margin"] == 1200.5
     assert summary["sizing_available_margin"] == 800.1
     assert summary["withdrawable_amount"] == 800.1
-    assert summary["total_upnl"] == pytest.approx(7.4)
+    assert summary["total_upnl"] == APPROX(7.4)
 
     positions = run(gateway.get_open_positions())
     assert len(positions) == 2
@@ -848,25 +863,7 @@ def test_hyperliquid_order_timeout_reason_and_clear_on_ws_update():
     reasons = gateway._collect_reconcile_reasons(now=now)
     assert "order_lifecycle_timeout" in reasons
 
-    gateway._on_ws_order_updates(
-        {
-            "channel": "orderUpdates",
-            "data": [
-                {
-                    "order": {
-                        "oid": 12345,
-                        "coin": "BTC",
-                        "side": "B",
-                        "sz": "0.01",
-                        "limitPx": "41000",
-                        "reduceOnly": False,
-                        "orderType": "Limit",
-                    },
-                    "status": "open",
-                }
-            ],
-        }
-    )
+    gateway._on_ws_order_updates(_make_ws_update(_ws_order_row(12345, "open")))
     assert "12345" not in gateway._pending_submitted_orders
 
 
@@ -880,32 +877,126 @@ def test_hyperliquid_terminal_order_update_schedules_account_refresh():
         return None
 
     gateway._refresh_account_summary_now = _fake_refresh
-    gateway._schedule_coro = lambda factory: scheduled.__setitem__("count", scheduled["count"] + 1)
+    gateway._schedule_coro = lambda factory, on_done=None: scheduled.__setitem__("count", scheduled["count"] + 1)
+
+    gateway._on_ws_order_updates(_make_ws_update(_ws_order_row(12345, "canceled")))
+
+    assert "12345" not in gateway._ws_orders
+    assert scheduled["count"] == 1
+
+
+def test_hyperliquid_terminal_order_update_batch_schedules_single_refresh():
+    gateway = FakeHyperliquidGateway()
+    gateway._ws_orders = {
+        oid: {"orderId": oid, "symbol": "BTC-USDC"} for oid in ("1", "2", "3")
+    }
+    gateway._ws_orders_raw = list(gateway._ws_orders.values())
+    scheduled = {"count": 0}
+    gateway._schedule_coro = lambda factory, on_done=None: scheduled.__setitem__("count", scheduled["count"] + 1)
 
     gateway._on_ws_order_updates(
-        {
-            "channel": "orderUpdates",
-            "data": [
-                {
-                    "order": {
-                        "oid": 12345,
-                        "coin": "BTC",
-                        "side": "B",
-                        "sz": "0.01",
-                        "limitPx": "41000",
-                        "reduceOnly": False,
-                        "orderType": "Limit",
-                    },
-                    "status": "canceled",
-                }
-            ],
-        }
+        _make_ws_update(
+            _ws_order_row(1, "canceled"),
+            _ws_order_row(2, "filled"),
+            _ws_order_row(3, "canceled"),
+        )
     )
 
-    assert "12345" not in gateway._ws_orders
+    assert gateway._ws_orders == {}
+    assert gateway._ws_orders_raw == []
     assert scheduled["count"] == 1
 
 
+def test_hyperliquid_terminal_order_updates_coalesce_account_refresh():
+    gateway = FakeHyperliquidGateway()
+    gateway._order_account_refresh_min_gap_seconds = 0.0
+    gateway._ws_orders = {oid: {"orderId": oid, "symbol": "BTC-USDC"} for oid in ("1", "2", "3")}
+    calls = {"count": 0}
+
+    async def _counting_summary():
+        calls["count"] += 1
+        return {}
+
+    gateway.get_account_summary = _counting_summary
+
+    async def _scenario():
+        gateway._loop = asyncio.get_running_loop()
+        # Three terminal updates land in the same synchronous frame.
+        for oid in (1, 2, 3):
+            gateway._on_ws_order_updates(_make_ws_update(_ws_order_row(oid, "canceled")))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert calls["count"] == 1
+        assert gateway._order_account_refresh_pending is False
+        # Once the refresh has landed, the next terminal update may schedule again.
+        gateway._ws_orders["4"] = {"orderId": "4", "symbol": "BTC-USDC"}
+        gateway._on_ws_order_updates(_make_ws_update(_ws_order_row(4, "canceled")))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert calls["count"] == 2
+
+    run(_scenario())
+
+
+def test_hyperliquid_account_refresh_not_stuck_when_scheduling_fails():
+    gateway = FakeHyperliquidGateway()
+    gateway._order_account_refresh_min_gap_seconds = 0.0
+    calls = {"count": 0}
+
+    async def _counting_summary():
+        calls["count"] += 1
+        return {}
+
+    gateway.get_account_summary = _counting_summary
+
+    class _ClosedLoop:
+        def call_soon_threadsafe(self, *args, **kwargs):
+            raise RuntimeError("Event loop is closed")
+
+    gateway._loop = _ClosedLoop()
+    gateway._schedule_account_summary_refresh()
+    assert gateway._order_account_refresh_pending is False
+
+    async def _scenario():
+        gateway._loop = asyncio.get_running_loop()
+        gateway._schedule_account_summary_refresh()
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert calls["count"] == 1
+        assert gateway._order_account_refresh_pending is False
+
+    run(_scenario())
+
+
+def test_hyperliquid_account_refresh_flag_clears_when_refresh_task_cancelled():
+    gateway = FakeHyperliquidGateway()
+    gateway._order_account_refresh_min_gap_seconds = 0.0
+
+    async def _hanging_summary():
+        await asyncio.Event().wait()
+
+    gateway.get_account_summary = _hanging_summary
+
+    async def _scenario():
+        gateway._loop = asyncio.get_running_loop()
+        gateway._schedule_account_summary_refresh()
+        await asyncio.sleep(0)
+        refresh_tasks = [
+            task
+            for task in asyncio.all_tasks()
+            if task.get_coro().__name__ == "_refresh_account_summary_now"
+        ]
+        assert len(refresh_tasks) == 1
+        assert gateway._order_account_refresh_pending is True
+        refresh_tasks[0].cancel()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert refresh_tasks[0].cancelled()
+        assert gateway._order_account_refresh_pending is False
+
+    run(_scenario())
+
+
 def test_hyperliquid_reconcile_min_gap_prevents_storm_and_tracks_reasons():
     gateway = FakeHyperliquidGateway()
     gateway._reconcile_min_gap_seconds = 60.0
@@ -939,6 +1030,57 @@ def test_hyperliquid_reconcile_min_gap_prevents_storm_and_tracks_reasons():
     assert gateway._reconcile_reason_counts.get("order_lifecycle_timeout") == 1
 
 
+def test_hyperliquid_reconcile_min_gap_suppresses_burst():
+    gateway = FakeHyperliquidGateway()
+    gateway._reconcile_min_gap_seconds = 60.0
+
+    async def _fake_orders(force_rest=False, publish=False):
+        return []
+
+    async def _fake_positions(force_rest=False, publish=False):
+        return []
+
+    gateway.get_open_orders = _fake_orders
+    gateway.get_open_positions = _fake_positions
+
+    async def _burst():
+        assert await gateway._audit_reconcile(reason="ws_stale") is True
+        return [await gateway._audit_reconcile(reason="ws_stale") for _ in range(10_000)]
+
+    suppressed = run(_burst())
+    assert not any(suppressed)
+    assert gateway._reconcile_count == 1
+    assert gateway._reconcile_reason_counts == {"ws_stale": 1}
+
+
+def test_hyperliquid_reconcile_concurrent_callers_run_once():
+    gateway = FakeHyperliquidGateway()
+    # Disable the min-gap so only the in-flight lock guards against the stampede.
+    gateway._reconcile_min_gap_seconds = 0.0
+    fetches = {"orders": 0, "positions": 0}
+
+    async def _slow_orders(force_rest=False, publish=False):
+        fetches["orders"] += 1
+        await asyncio.sleep(0)
+        return []
+
+    async def _slow_positions(force_rest=False, publish=False):
+        fetches["positions"] += 1
+        await asyncio.sleep(0)
+        return []
+
+    gateway.get_open_orders = _slow_orders
+    gateway.get_open_positions = _slow_positions
+
+    async def _stampede():
+        return await asyncio.gather(*[gateway._audit_reconcile(reason="ws_stale") for _ in range(100)])
+
+    results = run(_stampede())
+    assert results.count(True) == 1
+    assert gateway._reconcile_count == 1
+    assert fetches == {"orders": 1, "positions": 1}
+
+
 def test_hyperliquid_account_summary_exposes_stream_health():
     gateway = FakeHyperliquidGateway()
     summary = run(gateway.get_account_summary())
@@ -966,16 +1108,86 @@ def test_hyperliquid_account_summary_retries_transient_disconnect():
     assert state["calls"] >= 2
 
 
+def test_hyperliquid_rest_retry_uses_capped_exponential_backoff_with_jitter(monkeypatch):
+    gateway = FakeHyperliquidGateway()
+    gateway._rest_max_retries = 3
+    gateway._rest_retry_backoff = 0.1
+    gateway._rest_retry_backoff_max = 0.25
+    gateway._rest_retry_jitter = 0.5
+    original = gateway._info.user_state
+    state = {"calls": 0}
+
+    def _flaky_user_state(address: str):
+        state["calls"] += 1
+        if state["calls"] <= 3:
+            raise _DISCONNECT
+        return original(address)
+
+    delays: list[float] = []
+    jitter_ranges: list[tuple[float, float]] = []
+
+    async def _record_sleep(delay):
+        delays.append(delay)
+
+    def _max_jitter(low, high):
+        jitter_ranges.append((low, high))
+        return high
+
+    gateway._info.user_state = _flaky_user_state
+    monkeypatch.setattr(asyncio, "sleep", _record_sleep)
+    monkeypatch.setattr("backend.exchange.hyperliquid_gateway.random.uniform", _max_jitter)
+    summary = run(gateway.get_account_summary())
+
+    assert summary["total_equity"] > 0
+    assert state["calls"] == 4
+    assert jitter_ranges == [(0.0, 0.5)] * 3
+    # base * 2**attempt, capped at backoff_max, plus bounded jitter.
+    assert delays == APPROX([0.1 + 0.5, 0.2 + 0.5, 0.25 + 0.5])
+    assert delays[0] < delays[1] < delays[2]
+
+
 def test_hyperliquid_account_summary_uses_cache_on_repeated_disconnect():
     gateway = FakeHyperliquidGateway()
     cached = run(gateway.get_account_summary())
     gateway._rest_retry_backoff = 0.0
     gateway._rest_retry_backoff_max = 0.0
     gateway._rest_retry_jitter = 0.0
-    gateway._info.user_state = lambda address: (_ for _ in ()).throw(
-        RuntimeError("Connection aborted: Remote end closed connection without response")
-    )
+
+    def _always_fail(_address: str):
+        raise _DISCONNECT
+
+    gateway._info.user_state = _always_fail
     summary = run(gateway.get_account_summary())
     assert summary["total_equity"] == cached["total_equity"]
     assert summary["available_margin"] == cached["available_margin"]
     assert gateway.get_stream_health_snapshot()["last_account_summary_error"] is not None
+
+
+@pytest.mark.parametrize(
+    "raw_type,expected",
+    [
+        ("Take Profit Market", "TAKE_PROFIT_MARKET"),
+        ("Stop Limit", "STOP_MARKET"),
+        ("trigger", "STOP_MARKET"),
+        ("Limit", "LIMIT"),
+        ("", "LIMIT"),
+        (None, "LIMIT"),
+    ],
+)
+def test_hyperliquid_order_type_normalization_is_stable_across_calls(raw_type, expected):
+    for _ in range(2):
+        assert HyperliquidGateway._normalize_order_type(raw_type) == expected
+
+
+@pytest.mark.parametrize(
+    "status,expected",
+    [
+        ("Margin Canceled", True),
+        ("filled", True),
+        (" open ", False),
+        (None, False),
+    ],
+)
+def test_hyperliquid_terminal_status_is_stable_across_calls(status, expected):
+    for _ in range(2):
+        assert HyperliquidGateway._is_terminal_status(status) is expected
@@ -1,16 +1,8 @@
-import asyncio
-import sys
-from pathlib import Path
-
 from fastapi.responses import JSONResponse
 
-ROOT = Path(__file__).resolve().parents[2]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
-from backend.api.routes_orders import cancel_order, list_orders  # noqa: E402
-from backend.api.routes_positions import list_positions, update_targets  # noqa: E402
-from backend.trading.schemas import TargetsUpdateRequest  # noqa: E402
+from backend.api.routes_orders import cancel_order, list_orders
+from backend.api.routes_positions import list_positions, update_targets
+from backend.trading.schemas import TargetsUpdateRequest
 
 
 class FakeManager:
@@ -28,6 +20,7 @@ class FakeManager:
                 "stop_loss": None,
             }
         ]
+        self._positions_by_id = {pos["id"]: pos for pos in self.positions}
         self.canceled = []
         self.updated = []
 
@@ -47,30 +40,36 @@ class FakeManager:
         self.updated.append(
             {"position_id": position_id, "take_profit": take_profit, "stop_loss": stop_loss, "clear_tp": clear_tp, "clear_sl": clear_sl}
         )
-        for pos in self.positions:
-            if str(pos.get("id")) == str(position_id):
-                if clear_tp:
-                    pos["take_profit"] = None
-                if clear_sl:
-                    pos["stop_loss"] = None
-                if take_profit is not None:
-                    pos["take_profit"] = take_profit
-                if stop_loss is not None:
-                    pos["stop_loss"] = stop_loss
+        pos = self._positions_by_id.get(position_id)
+        if pos is not None:
+            if clear_tp:
+                pos["take_profit"] = None
+            if clear_sl:
+                pos["stop_loss"] = None
+            if take_profit is not None:
+                pos["take_profit"] = take_profit
+            if stop_loss is not None:
+                pos["stop_loss"] = stop_loss
         return {"position_id": position_id, "take_profit": take_profit, "stop_loss": stop_loss, "clear_tp": clear_tp, "clear_sl": clear_sl}
 
 
-def test_list_orders_returns_manager_data():
+async def _update_then_list_positions(req, manager):
+    # The read must observe the update, so both awaits share one loop entry in order.
+    resp = await update_targets("pos-1", req, manager)
+    return resp, await list_positions(False, manager)
+
+
+def test_list_orders_returns_manager_data(run):
     manager = FakeManager()
-    resp = asyncio.run(list_orders(manager))
+    resp = run(list_orders(manager))
     assert resp == [
         {"id": "abc", "symbol": "BTC-USDT", "side": "BUY", "size": 1.0, "status": "OPEN", "entry_price": None, "reduce_only": False}
     ]
 
 
-def test_list_positions_returns_manager_data():
+def test_list_positions_returns_manager_data(run):
     manager = FakeManager()
-    resp = asyncio.run(list_positions(False, manager))
+    resp = run(list_positions(False, manager))
     assert resp == [
         {
             "id": "pos-1",
@@ -85,52 +84,49 @@ def test_list_positions_returns_manager_data():
     ]
 
 
-def test_cancel_order_calls_manager_and_returns_response():
+def test_cancel_order_calls_manager_and_returns_response(run):
     manager = FakeManager()
-    resp = asyncio.run(cancel_order("abc", manager))
+    resp = run(cancel_order("abc", manager))
     assert resp == {"canceled": True, "order_id": "abc"}
     assert manager.canceled == ["abc"]
 
 
-def test_cancel_order_error_returns_400():
+def test_cancel_order_error_returns_400(run):
     manager = FakeManager()
-    resp = asyncio.run(cancel_order("fail", manager))
+    resp = run(cancel_order("fail", manager))
     assert isinstance(resp, JSONResponse)
     assert resp.status_code == 400
     assert b"Unable to cancel" in resp.body
 
 
-def test_update_targets_round_trip_positions_api():
+def test_update_targets_round_trip_positions_api(run):
     manager = FakeManager()
     req = TargetsUpdateRequest(take_profit=120.5, stop_loss=90.1)
-    resp = asyncio.run(update_targets("pos-1", req, manager))
+    resp, positions = run(_update_then_list_positions(req, manager))
     assert resp["take_profit"] == 120.5
     assert resp["stop_loss"] == 90.1
-    positions = asyncio.run(list_positions(False, manager))
     assert positions[0]["take_profit"] == 120.5
     assert positions[0]["stop_loss"] == 90.1
 
 
-def test_clear_tp_only_keeps_sl():
+def test_clear_tp_only_keeps_sl(run):
     manager = FakeManager()
     manager.positions[0]["take_profit"] = 125.0
     manager.positions[0]["stop_loss"] = 95.0
     req = TargetsUpdateRequest(clear_tp=True)
-    asyncio.run(update_targets("pos-1", req, manager))
-    positions = asyncio.run(list_positions(False, manager))
+    _, positions = run(_update_then_list_positions(req, manager))
     assert positions[0]["take_profit"] is None
     assert positions[0]["stop_loss"] == 95.0
     assert manager.updated[-1]["clear_tp"] is True
     assert manager.updated[-1]["clear_sl"] is False
 
 
-def test_clear_sl_only_keeps_tp():
+def test_clear_sl_only_keeps_tp(run):
     manager = FakeManager()
     manager.positions[0]["take_profit"] = 125.0
     manager.positions[0]["stop_loss"] = 95.0
     req = TargetsUpdateRequest(clear_sl=True)
-    asyncio.run(update_targets("pos-1", req, manager))
-    positions = asyncio.run(list_positions(False, manager))
+    _, positions = run(_update_then_list_positions(req, manager))
     assert positions[0]["take_profit"] == 125.0
     assert positions[0]["stop_loss"] is None
     assert manager.updated[-1]["clear_tp"] is False
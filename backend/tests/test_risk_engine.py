@@ -1,38 +1,38 @@
 import math
-import sys
-from pathlib import Path
+from types import MappingProxyType
 
 import pytest
 
-ROOT = Path(__file__).resolve().parents[2]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
-
-from backend.risk.risk_engine import (  # noqa: E402
+from backend.risk.risk_engine import (
     PositionSizingError,
     PositionSizingResult,
     calculate_position_size,
 )
 
 
-def base_config():
-    return {
+_BASE_CFG = MappingProxyType(
+    {
         "tickSize": 0.5,
         "stepSize": 0.1,
         "minOrderSize": 0.5,
         "maxOrderSize": 100.0,
         "maxLeverage": 5,
     }
+)
+
+
+def base_config():
+    """Mutable copy of the shared config for tests that override a field."""
+    return dict(_BASE_CFG)
 
 
 def test_long_sizing_basic():
-    cfg = base_config()
     result = calculate_position_size(
         equity=5000,
         risk_pct=1,
         entry_price=100,
         stop_price=95,
-        symbol_config=cfg,
+        symbol_config=_BASE_CFG,
     )
     assert isinstance(result, PositionSizingResult)
     assert result.side == "BUY"
@@ -41,13 +41,12 @@ def test_long_sizing_basic():
 
 
 def test_short_sizing_basic():
-    cfg = base_config()
     result = calculate_position_size(
         equity=5000,
         risk_pct=1,
         entry_price=95,
         stop_price=100,
-        symbol_config=cfg,
+        symbol_config=_BASE_CFG,
     )
     assert result.side == "SELL"
     assert math.isclose(result.size, 10.0)
@@ -55,26 +54,24 @@ def test_short_sizing_basic():
 
 
 def test_stop_equals_entry_rejected():
-    cfg = base_config()
     with pytest.raises(PositionSizingError):
         calculate_position_size(
             equity=1000,
             risk_pct=1,
             entry_price=100,
             stop_price=100,
-            symbol_config=cfg,
+            symbol_config=_BASE_CFG,
         )
 
 
 def test_below_min_order_rejected():
-    cfg = base_config()
     with pytest.raises(PositionSizingError):
         calculate_position_size(
             equity=100,
             risk_pct=0.1,
             entry_price=100,
             stop_price=99,
-            symbol_config=cfg,
+            symbol_config=_BASE_CFG,
         )
 
 
@@ -111,13 +108,12 @@ def test_leverage_cap_uses_leverage_capital_when_provided():
 
 
 def test_slippage_reduces_size():
-    cfg = base_config()
     result = calculate_position_size(
         equity=1000,
         risk_pct=1,
         entry_price=100,
         stop_price=99,
-        symbol_config=cfg,
+        symbol_config=_BASE_CFG,
         slippage_factor=0.1,  # 10% worse stop
     )
     # Without slippage: size = 10. With slippage, effective loss=1.1 -> size < 10
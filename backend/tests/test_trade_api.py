@@ -1,19 +1,20 @@
-import asyncio
-import sys
-from pathlib import Path
-
+import pytest
 from fastapi.responses import JSONResponse
 
-ROOT = Path(__file__).resolve().parents[2]
-if str(ROOT) not in sys.path:
-    sys.path.insert(0, str(ROOT))
+from backend.api.routes_risk import atr_stop, configure_gateway as configure_risk_gateway
+from backend.api.routes_trade import trade
+from backend.api.routes_venue import configure_venue_controller, get_venue, set_venue
+from backend.risk.risk_engine import PositionSizingResult
+from backend.trading.schemas import AtrStopRequest, TradeRequest, VenueSwitchRequest
+import backend.api.routes_risk as routes_risk
+
 
-from backend.api.routes_risk import atr_stop, configure_gateway as configure_risk_gateway  # noqa: E402
-from backend.api.routes_trade import trade  # noqa: E402
-from backend.api.routes_venue import configure_venue_controller, get_venue, set_venue  # noqa: E402
-from backend.risk.risk_engine import PositionSizingResult  # noqa: E402
-from backend.trading.schemas import AtrStopRequest, TradeRequest, VenueSwitchRequest  # noqa: E402
-import backend.api.routes_risk as routes_risk  # noqa: E402
+_FAKE_KLINES = (
+    {"open_time": 1, "open": 100, "high": 103, "low": 99, "close": 102},
+    {"open_time": 2, "open": 102, "high": 104, "low": 100, "close": 103},
+    {"open_time": 3, "open": 103, "high": 105, "low": 101, "close": 104},
+    {"open_time": 4, "open": 104, "high": 106, "low": 102, "close": 105},
+)
 
 
 class FakeManager:
@@ -52,8 +53,19 @@ class FakeManager:
         }
 
 
-def test_trade_preview_success():
-    manager = FakeManager()
+@pytest.fixture(scope="module")
+def shared_manager():
+    return FakeManager()
+
+
+@pytest.fixture
+def manager(shared_manager):
+    shared_manager.preview_called = False
+    shared_manager.execute_called = False
+    return shared_manager
+
+
+def test_trade_preview_success(run, manager):
     payload = TradeRequest(
         symbol="BTC-USDT",
         entry_price=100,
@@ -62,14 +74,13 @@ def test_trade_preview_success():
         preview=True,
         execute=False,
     )
-    resp = asyncio.run(trade(payload, manager))
+    resp = run(trade(payload, manager))
     assert resp.side == "BUY"
     assert resp.size == 1.2
     assert manager.preview_called is True
 
 
-def test_trade_execute_success():
-    manager = FakeManager()
+def test_trade_execute_success(run, manager):
     payload = TradeRequest(
         symbol="BTC-USDT",
         entry_price=100,
@@ -78,14 +89,13 @@ def test_trade_execute_success():
         preview=False,
         execute=True,
     )
-    resp = asyncio.run(trade(payload, manager))
+    resp = run(trade(payload, manager))
     assert resp["executed"] is True
     assert resp["exchange_order_id"] == "order-xyz"
     assert manager.execute_called is True
 
 
-def test_trade_preview_validation_error():
-    manager = FakeManager()
+def test_trade_preview_validation_error(run, manager, monkeypatch):
     payload = TradeRequest(
         symbol="BTC-USDT",
         entry_price=100,
@@ -98,8 +108,8 @@ def test_trade_preview_validation_error():
     async def raise_error(**kwargs):
         raise ValueError("Stop price equals entry price.")
 
-    manager.preview_trade = raise_error  # type: ignore
-    resp = asyncio.run(trade(payload, manager))
+    monkeypatch.setattr(manager, "preview_trade", raise_error)
+    resp = run(trade(payload, manager))
     assert isinstance(resp, JSONResponse)
     assert resp.status_code == 400
     assert b"Stop price equals entry price" in resp.body
@@ -117,24 +127,19 @@ class FakeRiskGateway:
 
     async def fetch_klines(self, symbol: str, timeframe: str, limit: int):
         self.calls.append((symbol, timeframe, limit))
-        return [
-            {"open_time": 1, "open": 100, "high": 103, "low": 99, "close": 102},
-            {"open_time": 2, "open": 102, "high": 104, "low": 100, "close": 103},
-            {"open_time": 3, "open": 103, "high": 105, "low": 101, "close": 104},
-            {"open_time": 4, "open": 104, "high": 106, "low": 102, "close": 105},
-        ]
+        return list(_FAKE_KLINES)
 
 
 class FakeApexRiskGateway(FakeRiskGateway):
     venue = "apex"
 
 
-def test_atr_stop_uses_gateway_fetch_klines(monkeypatch):
+def test_atr_stop_uses_gateway_fetch_klines(run, monkeypatch):
     gateway = FakeRiskGateway()
     configure_risk_gateway(gateway)
     monkeypatch.setattr("backend.api.routes_risk.get_settings", lambda: FakeAtrSettings())
 
-    resp = asyncio.run(
+    resp = run(
         atr_stop(
             AtrStopRequest(symbol="BTC-USDT", side="long", entry_price=100.0),
             gateway,
@@ -147,12 +152,12 @@ def test_atr_stop_uses_gateway_fetch_klines(monkeypatch):
     assert gateway.calls[0][2] >= 200
 
 
-def test_atr_stop_caps_limit_for_apex_default_timeframe(monkeypatch):
+def test_atr_stop_caps_limit_for_apex_default_timeframe(run, monkeypatch):
     gateway = FakeApexRiskGateway()
     configure_risk_gateway(gateway)
     monkeypatch.setattr("backend.api.routes_risk.get_settings", lambda: FakeAtrSettings())
 
-    resp = asyncio.run(
+    resp = run(
         atr_stop(
             AtrStopRequest(symbol="BTC-USDT", side="long", entry_price=100.0),
             gateway,
@@ -163,12 +168,12 @@ def test_atr_stop_caps_limit_for_apex_default_timeframe(monkeypatch):
     assert gateway.calls[0][2] == 120
 
 
-def test_atr_stop_uses_minimal_limit_for_apex_3m(monkeypatch):
+def test_atr_stop_uses_minimal_limit_for_apex_3m(run, monkeypatch):
     gateway = FakeApexRiskGateway()
     configure_risk_gateway(gateway)
     monkeypatch.setattr("backend.api.routes_risk.get_settings", lambda: FakeAtrSettings())
 
-    resp = asyncio.run(
+    resp = run(
         atr_stop(
             AtrStopRequest(symbol="BTC-USDT", side="long", entry_price=100.0, timeframe="3m"),
             gateway,
@@ -179,8 +184,46 @@ def test_atr_stop_uses_minimal_limit_for_apex_3m(monkeypatch):
     assert gateway.calls[0][2] == 9
 
 
+def test_atr_stop_reuses_klines_until_candle_close(run, monkeypatch):
+    gateway = FakeRiskGateway()
+    configure_risk_gateway(gateway)
+    monkeypatch.setattr("backend.api.routes_risk.get_settings", lambda: FakeAtrSettings())
+    clock = {"ns": 1_000 * 900_000 * 1_000_000}
+    monkeypatch.setattr("backend.api.routes_risk.time.time_ns", lambda: clock["ns"])
+    request = AtrStopRequest(symbol="BTC-USDT", side="long", entry_price=100.0)
+
+    first = run(atr_stop(request, gateway))
+    clock["ns"] += 60 * 1_000_000_000
+    second = run(atr_stop(request, gateway))
+    assert len(gateway.calls) == 1
+    assert second.atr_value == first.atr_value
+
+    # Next 15m candle has closed; the window must be refetched.
+    clock["ns"] += 15 * 60 * 1_000_000_000
+    run(atr_stop(request, gateway))
+    assert len(gateway.calls) == 2
+
+
+def test_klines_cache_prunes_expired_windows_and_stays_bounded(run, monkeypatch):
+    gateway = FakeRiskGateway()
+    configure_risk_gateway(gateway)
+    clock = {"ns": 1_000 * 900_000 * 1_000_000}
+    monkeypatch.setattr("backend.api.routes_risk.time.time_ns", lambda: clock["ns"])
+    monkeypatch.setattr("backend.api.routes_risk._KLINES_CACHE_MAX_ENTRIES", 3)
+
+    for limit in (10, 11, 12, 13):
+        run(routes_risk._fetch_klines_cached(gateway, "BTC-USDT", "15m", limit))
+    # Oldest window is evicted once the bound is exceeded.
+    assert [key[3] for key in routes_risk._klines_cache] == [11, 12, 13]
+
+    # After the candle closes, storing any new window drops every expired one.
+    clock["ns"] += 15 * 60 * 1_000_000_000
+    run(routes_risk._fetch_klines_cached(gateway, "ETH-USDT", "15m", 10))
+    assert [key[1] for key in routes_risk._klines_cache] == ["ETH-USDT"]
+
+
 def test_drop_incomplete_tail_excludes_open_candle(monkeypatch):
-    monkeypatch.setattr("backend.api.routes_risk.time.time", lambda: 1000.0)
+    monkeypatch.setattr("backend.api.routes_risk.time.time_ns", lambda: 1_000_000_000_000)
     candles = [
         {"open_time": 998_000},
         {"open_time": 999_000},
@@ -190,7 +233,7 @@ def test_drop_incomplete_tail_excludes_open_candle(monkeypatch):
 
 
 def test_drop_incomplete_tail_keeps_closed_candle(monkeypatch):
-    monkeypatch.setattr("backend.api.routes_risk.time.time", lambda: 1000.0)
+    monkeypatch.setattr("backend.api.routes_risk.time.time_ns", lambda: 1_000_000_000_000)
     candles = [
         {"open_time": 876_000},
         {"open_time": 938_000},
@@ -211,15 +254,15 @@ class FakeVenueController:
         return self.active_venue
 
 
-def test_get_venue_state():
+def test_get_venue_state(run):
     configure_venue_controller(FakeVenueController())
-    resp = asyncio.run(get_venue())
+    resp = run(get_venue())
     assert resp.active_venue == "apex"
 
 
-def test_set_venue_state():
+def test_set_venue_state(run):
     ctrl = FakeVenueController()
     configure_venue_controller(ctrl)
-    resp = asyncio.run(set_venue(VenueSwitchRequest(active_venue="hyperliquid")))
+    resp = run(set_venue(VenueSwitchRequest(active_venue="hyperliquid")))
     assert resp.active_venue == "hyperliquid"
     assert ctrl.active_venue == "hyperliquid"
@@ -1,4 +1,6 @@
+import asyncio
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from typing import Any, Dict, Optional, Tuple
 import re
 import time
@@ -8,22 +10,100 @@ from backend.exchange.exchange_gateway import ExchangeGateway
 from backend.risk import risk_engine
 
 logger = get_logger(__name__)
+_SYMBOL_CODE_RE = re.compile(r"[A-Z0-9]+-[A-Z0-9]+")
+_QUOTE_SUFFIXES = ("USDT", "USDC", "USDC.E", "USD")
+_TPSL_TYPE_PREFIXES = ("STOP", "TAKE_PROFIT")
 
 
 def _coerce_float(value: Any) -> Optional[float]:
+    value_type = type(value)
+    if value_type is float:
+        return value
     try:
+        if value_type is int:
+            return float(value)
         if value is None:
             return None
         return float(value)
-    except (TypeError, ValueError):
+    except (TypeError, ValueError, OverflowError):
+        # OverflowError: ints beyond float range, e.g. a corrupt size field in a venue row.
         return None
 
 
+# Flat TP/SL price aliases, in priority order; triggerPrice and the nested open*Params follow them.
+_TP_PRICE_KEYS = ("tpTriggerPrice", "tpPrice", "openTpParam", "takeProfitPrice", "takeProfit", "tp")
+_SL_PRICE_KEYS = ("slTriggerPrice", "slPrice", "openSlParam", "stopLossPrice", "stopLoss", "sl")
+
+
+def _number_or_none(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except Exception:
+            return None
+    return None
+
+
+def _order_trigger_price(
+    order: Dict[str, Any], keys: Tuple[str, ...], trigger_price_applies: bool, params_key: str
+) -> Optional[float]:
+    """Return the first numeric TP or SL price on an order, probing aliases lazily."""
+    for key in keys:
+        value = _number_or_none(order.get(key))
+        if value is not None:
+            return value
+    if trigger_price_applies:
+        value = _number_or_none(order.get("triggerPrice"))
+        if value is not None:
+            return value
+    return _number_or_none((order.get(params_key) or {}).get("triggerPrice"))
+
+
+def _hl_leg_accepted(status: Any) -> bool:
+    if isinstance(status, str):
+        return status == "waitingForFill"
+    if isinstance(status, dict):
+        if status.get("error"):
+            return False
+        for key in ("resting", "filled", "success"):
+            if status.get(key):
+                return True
+    return False
+
+
+@lru_cache(maxsize=2048)
+def _normalize_symbol_text(symbol: str) -> str:
+    # Called for every order/position row on each reconcile; the symbol universe is small.
+    sym = symbol.upper()
+    if "-" in sym or not sym.endswith(_QUOTE_SUFFIXES):
+        return sym
+    for quote in _QUOTE_SUFFIXES:
+        if sym.endswith(quote):
+            return f"{sym[:-len(quote)]}-{quote}"
+    return sym
+
+
 def _infer_decimal_places(value: Any) -> Optional[int]:
     if value in (None, "", 0):
         return None
+    return _decimal_places_from_text(str(value))
+
+
+@lru_cache(maxsize=256)
+def _decimal_places_from_text(text: str) -> Optional[int]:
+    # A catalog only carries a handful of distinct tick/step sizes, so list_symbols mostly hits the cache.
+    # Plain decimal strings such as "0.0010" are counted directly; exponents and the rest go through Decimal.
+    body = text.strip()
+    if body[:1] in ("+", "-"):
+        body = body[1:]
+    whole, _, frac = body.partition(".")
+    digits = whole + frac
+    if digits.isascii() and digits.isdigit():
+        return len(frac.rstrip("0"))
     try:
-        dec_value = Decimal(str(value))
+        dec_value = Decimal(text)
     except (InvalidOperation, ValueError, TypeError):
         return None
     dec_value = dec_value.normalize()
@@ -36,6 +116,37 @@ def _infer_decimal_places(value: Any) -> Optional[int]:
 class OrderManager:
     """Coordinates sizing, risk caps, and order placement."""
 
+    __slots__ = (
+        "gateway",
+        "_venue",
+        "_venue_needs_tpsl_backfill",
+        "per_trade_risk_cap_pct",
+        "daily_loss_cap_pct",
+        "open_risk_cap_pct",
+        "slippage_factor",
+        "fee_buffer_pct",
+        "hyperliquid_min_notional_usdc",
+        "daily_realized_loss",
+        "open_risk_estimates",
+        "open_orders",
+        "positions",
+        "pending_order_prices",
+        "pending_order_prices_client",
+        "position_targets",
+        "_tpsl_targets_by_symbol",
+        "_tpsl_order_meta_by_symbol",
+        "_tpsl_local_hints",
+        "_tpsl_hint_ttl_seconds",
+        "_depth_summary_cache",
+        "_depth_summary_cache_ttl",
+        "_tpsl_backfill_last_ts",
+        "_tpsl_backfill_min_gap_seconds",
+        "_positions_inflight",
+    )
+
+    _TPSL_CANCELED_STATUSES = frozenset({"canceled", "cancelled"})
+    _TPSL_CLOSED_STATUSES = _TPSL_CANCELED_STATUSES | {"triggered", "filled"}
+
     def __init__(
         self,
         gateway: ExchangeGateway,
@@ -48,6 +159,9 @@ class OrderManager:
         hyperliquid_min_notional_usdc: float = 10.0,
     ) -> None:
         self.gateway = gateway
+        # One manager per gateway and a gateway never changes venue, so normalize it once.
+        self._venue = (getattr(gateway, "venue", "") or "").lower()
+        self._venue_needs_tpsl_backfill = self._venue in {"apex", "hyperliquid"}
         self.per_trade_risk_cap_pct = per_trade_risk_cap_pct
         self.daily_loss_cap_pct = daily_loss_cap_pct
         self.open_risk_cap_pct = open_risk_cap_pct
@@ -71,11 +185,12 @@ class OrderManager:
         )
         self._depth_summary_cache: Dict[tuple[str, int, int], tuple[float, Dict[str, Any]]] = {}
         self._depth_summary_cache_ttl = 1.5
-        self._tpsl_backfill_last_ts = 0.0
+        self._tpsl_backfill_last_ts = float("-inf")
         self._tpsl_backfill_min_gap_seconds = 5.0
+        self._positions_inflight: Optional[asyncio.Future[list[Dict[str, Any]]]] = None
 
     async def _get_account_context(self) -> tuple[float, Optional[float]]:
-        venue = (getattr(self.gateway, "venue", "") or "").lower()
+        venue = self._venue
         equity: Optional[float] = None
         available_margin: Optional[float] = None
         summary_getter = getattr(self.gateway, "get_account_summary", None)
@@ -109,22 +224,33 @@ class OrderManager:
             available_margin = equity
         return float(equity), available_margin
 
+    async def _load_configs_and_account_context(self) -> tuple[float, Optional[float]]:
+        """Load symbol configs and the account context concurrently; config errors take precedence."""
+        configs_result, context = await asyncio.gather(
+            self.gateway.ensure_configs_loaded(),
+            self._get_account_context(),
+            return_exceptions=True,
+        )
+        if isinstance(configs_result, BaseException):
+            raise configs_result
+        if isinstance(context, BaseException):
+            raise context
+        return context
+
     def _enforce_venue_margin_guard(
         self,
         *,
-        symbol: str,
+        symbol_info: Dict[str, Any],
         sizing: risk_engine.PositionSizingResult,
         available_margin: Optional[float],
     ) -> None:
-        venue = (getattr(self.gateway, "venue", "") or "").lower()
-        if venue != "hyperliquid":
+        if self._venue != "hyperliquid":
             return
         margin = float(available_margin or 0.0)
         if margin <= 0:
             raise risk_engine.PositionSizingError(
                 "Available margin is non-positive for Hyperliquid. Transfer collateral to your perp account."
             )
-        symbol_info = self.gateway.get_symbol_info(symbol) or {}
         max_leverage = _coerce_float(symbol_info.get("maxLeverage"))
         if max_leverage is None or max_leverage <= 0:
             max_leverage = 1.0
@@ -202,7 +328,7 @@ class OrderManager:
         return candidate
 
     def _estimate_position_risk(self, position: Dict[str, Any]) -> Optional[float]:
-        entry = _coerce_float(position.get("entry_price") or position.get("entryPrice"))
+        # Positions without a stop carry no bounded risk; bail before coercing entry/size.
         stop = _coerce_float(
             position.get("stop_loss")
             or position.get("stopLoss")
@@ -210,8 +336,11 @@ class OrderManager:
             or position.get("slPrice")
             or position.get("stopLossPrice")
         )
+        if stop is None:
+            return None
+        entry = _coerce_float(position.get("entry_price") or position.get("entryPrice"))
         size = _coerce_float(position.get("size") or position.get("positionSize"))
-        if entry is None or stop is None or size is None:
+        if entry is None or size is None:
             return None
         loss = abs(entry - stop) * abs(size)
         return loss if loss > 0 else None
@@ -226,9 +355,8 @@ class OrderManager:
         Validate grouped HL order submission (entry + attached TP/SL legs).
         Returns warning strings when TP/SL legs were not clearly accepted.
         """
-        venue = (getattr(self.gateway, "venue", "") or "").lower()
         order_requests = payload.get("order_requests")
-        if venue != "hyperliquid" or not isinstance(order_requests, list) or len(order_requests) <= 1:
+        if self._venue != "hyperliquid" or not isinstance(order_requests, list) or len(order_requests) <= 1:
             return []
 
         raw = order_resp.get("raw") if isinstance(order_resp, dict) else None
@@ -245,20 +373,9 @@ class OrderManager:
                 "TP/SL acceptance may be incomplete."
             ]
 
-        def _accepted(status: Any) -> bool:
-            if isinstance(status, str):
-                return status == "waitingForFill"
-            if isinstance(status, dict):
-                if status.get("error"):
-                    return False
-                for key in ("resting", "filled", "success"):
-                    if status.get(key):
-                        return True
-            return False
-
         failed: list[str] = []
         for idx, status in enumerate(statuses[:expected_legs], start=1):
-            if _accepted(status):
+            if _hl_leg_accepted(status):
                 continue
             failed.append(f"leg{idx}={status}")
 
@@ -277,12 +394,14 @@ class OrderManager:
     ) -> None:
         open_orders = open_orders if open_orders is not None else self.open_orders
         positions = positions if positions is not None else self.positions
-        open_ids = {order.get("id") for order in open_orders if order.get("id")}
-        rebuilt: Dict[str, float] = {
-            order_id: risk
-            for order_id, risk in self.open_risk_estimates.items()
-            if order_id in open_ids
-        }
+        rebuilt: Dict[str, float] = {}
+        if self.open_risk_estimates:
+            open_ids = {order.get("id") for order in open_orders if order.get("id")}
+            rebuilt = {
+                order_id: risk
+                for order_id, risk in self.open_risk_estimates.items()
+                if order_id in open_ids
+            }
         for pos in positions or []:
             risk = self._estimate_position_risk(pos)
             if risk is None:
@@ -296,13 +415,7 @@ class OrderManager:
         """Normalize symbols to a consistent KEY-QUOTE shape for map lookups."""
         if not symbol:
             return ""
-        sym = str(symbol).upper()
-        if "-" in sym:
-            return sym
-        for quote in ("USDT", "USDC", "USDC.E", "USD"):
-            if sym.endswith(quote):
-                return f"{sym[:-len(quote)]}-{quote}"
-        return sym
+        return _normalize_symbol_text(str(symbol))
 
     def _set_local_tpsl_hint(
         self,
@@ -316,7 +429,7 @@ class OrderManager:
         sym_key = self._normalize_symbol_value(symbol)
         if not sym_key:
             return
-        now = time.time()
+        now = time.monotonic()
         hint = self._tpsl_local_hints.setdefault(sym_key, {})
         if take_profit is not None:
             hint["take_profit"] = float(take_profit)
@@ -351,7 +464,7 @@ class OrderManager:
         if hint_ts is None:
             return ws_or_cache_value
         try:
-            age = max(0.0, time.time() - float(hint_ts))
+            age = max(0.0, time.monotonic() - float(hint_ts))
         except Exception:
             age = self._tpsl_hint_ttl_seconds + 1.0
         # Fresh hint wins.
@@ -376,7 +489,7 @@ class OrderManager:
         if not isinstance(order, dict):
             return False
         order_type = (order.get("type") or order.get("orderType") or order.get("order_type") or "").upper()
-        if not (order_type.startswith("STOP") or order_type.startswith("TAKE_PROFIT")):
+        if not order_type.startswith(_TPSL_TYPE_PREFIXES):
             return False
         if bool(order.get("isPositionTpsl")):
             return True
@@ -418,56 +531,32 @@ class OrderManager:
         Returns True when the payload only carried cancellations (no surviving targets) so callers
         can trigger a follow-up refresh to rehydrate the map.
         """
-        needs_refresh = False
-        # Work only on TP/SL position orders; ignore unrelated orders to avoid churn.
-        tpsl_orders: list[Dict[str, Any]] = []
+        # Single pass: split TP/SL position orders into live and closed; ignore everything else.
+        # Closed orders never yield targets, so only the live ones are handed to the extractor.
+        tpsl_count = 0
+        live_orders: list[Dict[str, Any]] = []
+        closed_orders: list[Tuple[str, Dict[str, Any]]] = []
         for o in raw_orders or []:
-            if not isinstance(o, dict):
-                continue
-            status_raw = str(o.get("status") or o.get("orderStatus") or "").lower()
-            order_type = (o.get("type") or o.get("orderType") or o.get("order_type") or "").upper()
             if not self._is_tpsl_order(o):
                 continue
-            tpsl_orders.append(o)
-        if not tpsl_orders:
+            tpsl_count += 1
+            status_raw = str(o.get("status") or o.get("orderStatus") or "").lower()
+            if status_raw in self._TPSL_CLOSED_STATUSES:
+                closed_orders.append((status_raw, o))
+            else:
+                live_orders.append(o)
+        if not tpsl_count:
             return False
-        raw_orders = tpsl_orders
 
         # Handle one-off canceled TP/SL pushes to drop only that target for the symbol.
-        if len(raw_orders or []) == 1:
-            o = raw_orders[0]
-            if isinstance(o, dict):
-                status_raw = str(o.get("status") or o.get("orderStatus") or "").lower()
-                order_type = (o.get("type") or o.get("orderType") or o.get("order_type") or "").upper()
-                if status_raw in {"canceled", "cancelled"} and self._is_tpsl_order(o):
-                    sym_key = self._normalize_symbol_value(o.get("symbol") or o.get("market"))
-                    if sym_key:
-                        entry = self._tpsl_targets_by_symbol.get(sym_key, {}).copy()
-                        hints = self.position_targets.get(sym_key, {}).copy()
-                        if order_type.startswith("TAKE_PROFIT"):
-                            entry.pop("take_profit", None)
-                            hints.pop("take_profit", None)
-                        if order_type.startswith("STOP"):
-                            entry.pop("stop_loss", None)
-                            hints.pop("stop_loss", None)
-                        if entry:
-                            self._tpsl_targets_by_symbol[sym_key] = entry
-                        else:
-                            self._tpsl_targets_by_symbol.pop(sym_key, None)
-                        if hints:
-                            self.position_targets[sym_key] = hints
-                        else:
-                            self.position_targets.pop(sym_key, None)
-                        self._set_local_tpsl_hint(
-                            symbol=sym_key,
-                            clear_tp=order_type.startswith("TAKE_PROFIT"),
-                            clear_sl=order_type.startswith("STOP"),
-                        )
-                    needs_refresh = True
-                    return needs_refresh
+        if tpsl_count == 1 and closed_orders and closed_orders[0][0] in self._TPSL_CANCELED_STATUSES:
+            o = closed_orders[0][1]
+            sym_key = self._normalize_symbol_value(o.get("symbol") or o.get("market"))
+            if sym_key:
+                self._drop_tpsl_target(sym_key, o)
+            return True
 
-        active_map = self._extract_tpsl_from_orders(raw_orders)
-        has_active = bool(active_map)
+        active_map = self._extract_tpsl_from_orders(live_orders)
         if active_map:
             # Explicit stream payload contradiction overrides fresh local hints immediately.
             for sym_key, values in active_map.items():
@@ -487,48 +576,41 @@ class OrderManager:
 
         # Handle batches that carry only canceled TP/SL orders (no active updates).
         removed_symbol = False
-        if not has_active:
-            for o in raw_orders or []:
-                if not isinstance(o, dict):
-                    continue
-                status_raw = str(o.get("status") or o.get("orderStatus") or "").lower()
-                order_type = (o.get("type") or o.get("orderType") or o.get("order_type") or "").upper()
-                if status_raw not in {"canceled", "cancelled", "triggered", "filled"}:
-                    continue
-                if not self._is_tpsl_order(o):
-                    continue
+        if not active_map:
+            for _, o in closed_orders:
                 sym_key = self._normalize_symbol_value(o.get("symbol") or o.get("market"))
                 if not sym_key:
                     continue
-                entry = self._tpsl_targets_by_symbol.get(sym_key, {}).copy()
-                hints = self.position_targets.get(sym_key, {}).copy()
-                if order_type.startswith("TAKE_PROFIT"):
-                    entry.pop("take_profit", None)
-                    hints.pop("take_profit", None)
-                if order_type.startswith("STOP"):
-                    entry.pop("stop_loss", None)
-                    hints.pop("stop_loss", None)
-                if entry:
-                    self._tpsl_targets_by_symbol[sym_key] = entry
-                else:
-                    self._tpsl_targets_by_symbol.pop(sym_key, None)
-                if hints:
-                    self.position_targets[sym_key] = hints
-                else:
-                    self.position_targets.pop(sym_key, None)
-                self._set_local_tpsl_hint(
-                    symbol=sym_key,
-                    clear_tp=order_type.startswith("TAKE_PROFIT"),
-                    clear_sl=order_type.startswith("STOP"),
-                )
+                self._drop_tpsl_target(sym_key, o)
                 removed_symbol = True
         if active_map:
             # Merge without clearing missing keys; cancels are handled above, so merging keeps surviving targets intact.
             self._merge_tpsl_map(active_map, replace=False)
-        # canceled-only snapshot: do nothing; keep existing map intact
-        if removed_symbol and not active_map:
-            needs_refresh = True
-        return needs_refresh
+        # Only a canceled-only batch asks the caller to refresh and rehydrate surviving targets.
+        return removed_symbol
+
+    def _drop_tpsl_target(self, sym_key: str, order: Dict[str, Any]) -> None:
+        """Clear the TP or SL leg that a closed TP/SL order covered for sym_key."""
+        order_type = (order.get("type") or order.get("orderType") or order.get("order_type") or "").upper()
+        is_tp = order_type.startswith("TAKE_PROFIT")
+        is_sl = order_type.startswith("STOP")
+        entry = self._tpsl_targets_by_symbol.get(sym_key, {}).copy()
+        hints = self.position_targets.get(sym_key, {}).copy()
+        if is_tp:
+            entry.pop("take_profit", None)
+            hints.pop("take_profit", None)
+        if is_sl:
+            entry.pop("stop_loss", None)
+            hints.pop("stop_loss", None)
+        if entry:
+            self._tpsl_targets_by_symbol[sym_key] = entry
+        else:
+            self._tpsl_targets_by_symbol.pop(sym_key, None)
+        if hints:
+            self.position_targets[sym_key] = hints
+        else:
+            self.position_targets.pop(sym_key, None)
+        self._set_local_tpsl_hint(symbol=sym_key, clear_tp=is_tp, clear_sl=is_sl)
 
     async def preview_trade(
         self,
@@ -541,8 +623,7 @@ class OrderManager:
         tp: Optional[float] = None,
     ) -> Tuple[risk_engine.PositionSizingResult, list[str]]:
         """Run sizing without placing an order."""
-        await self.gateway.ensure_configs_loaded()
-        equity, available_margin = await self._get_account_context()
+        equity, available_margin = await self._load_configs_and_account_context()
         symbol_info = self.gateway.get_symbol_info(symbol)
         if not symbol_info:
             raise risk_engine.PositionSizingError(f"Symbol config unavailable for {symbol}; refresh configs and retry.")
@@ -557,12 +638,12 @@ class OrderManager:
             fee_buffer_pct=self.fee_buffer_pct,
             leverage_capital=(
                 available_margin
-                if (getattr(self.gateway, "venue", "") or "").lower() == "hyperliquid"
+                if self._venue == "hyperliquid"
                 else None
             ),
         )
         self._enforce_venue_margin_guard(
-            symbol=symbol,
+            symbol_info=symbol_info,
             sizing=result,
             available_margin=available_margin,
         )
@@ -593,8 +674,7 @@ class OrderManager:
         tp: Optional[float] = None,
     ) -> Dict[str, Any]:
         """Re-run sizing and place order when safe."""
-        await self.gateway.ensure_configs_loaded()
-        equity, available_margin = await self._get_account_context()
+        equity, available_margin = await self._load_configs_and_account_context()
         symbol_info = self.gateway.get_symbol_info(symbol)
         if not symbol_info:
             raise risk_engine.PositionSizingError(f"Symbol config unavailable for {symbol}; refresh configs and retry.")
@@ -615,12 +695,12 @@ class OrderManager:
             fee_buffer_pct=self.fee_buffer_pct,
             leverage_capital=(
                 available_margin
-                if (getattr(self.gateway, "venue", "") or "").lower() == "hyperliquid"
+                if self._venue == "hyperliquid"
                 else None
             ),
         )
         self._enforce_venue_margin_guard(
-            symbol=symbol,
+            symbol_info=symbol_info,
             sizing=sizing,
             available_margin=available_margin,
         )
@@ -666,7 +746,7 @@ class OrderManager:
 
         order_resp = await self.gateway.place_order(payload)
         exchange_order_id = order_resp.get("exchange_order_id")
-        venue = (getattr(self.gateway, "venue", "") or "").lower()
+        venue = self._venue
         if (
             not exchange_order_id
             and venue == "hyperliquid"
@@ -754,12 +834,18 @@ class OrderManager:
         """Return open orders from gateway and update cache."""
         raw_orders = await self.gateway.get_open_orders()
         normalized: list[Dict[str, Any]] = []
+        open_ids: set[str] = set()
+        open_cids: set[str] = set()
         for order in raw_orders:
             if not self._include_in_open_orders(order):
                 continue
             norm = self._normalize_order(order)
             oid = norm.get("id")
             cid = norm.get("client_id")
+            if oid:
+                open_ids.add(oid)
+            if cid:
+                open_cids.add(cid)
             if not norm.get("entry_price"):
                 if oid and oid in self.pending_order_prices:
                     norm["entry_price"] = self.pending_order_prices.get(oid)
@@ -768,13 +854,11 @@ class OrderManager:
             normalized.append(norm)
         self.open_orders = normalized
         self._rebuild_open_risk_estimates(open_orders=self.open_orders, positions=self.positions)
-        # drop pending price hints for orders no longer open
-        open_ids = {o.get("id") for o in self.open_orders if o.get("id")}
-        open_cids = {o.get("client_id") for o in self.open_orders if o.get("client_id")}
-        self.pending_order_prices = {k: v for k, v in self.pending_order_prices.items() if k in open_ids}
-        self.pending_order_prices_client = {
-            k: v for k, v in self.pending_order_prices_client.items() if k in open_cids
-        }
+        # drop pending price hints for orders no longer open; usually nothing is stale
+        for stale_id in self.pending_order_prices.keys() - open_ids:
+            del self.pending_order_prices[stale_id]
+        for stale_cid in self.pending_order_prices_client.keys() - open_cids:
+            del self.pending_order_prices_client[stale_cid]
         return self.open_orders
 
     async def list_symbols(self) -> list[Dict[str, Any]]:
@@ -788,7 +872,7 @@ class OrderManager:
             if not code or not isinstance(code, str):
                 continue
             code_clean = code.strip().upper()
-            if not re.fullmatch(r"[A-Z0-9]+-[A-Z0-9]+", code_clean):
+            if not _SYMBOL_CODE_RE.fullmatch(code_clean):
                 continue
             base = cfg.get("baseAsset") or cfg.get("baseTokenId") or cfg.get("base_token")
             quote = cfg.get("quoteAsset") or cfg.get("settleAssetId") or cfg.get("quote_token")
@@ -828,6 +912,26 @@ class OrderManager:
 
     async def list_positions(self) -> list[Dict[str, Any]]:
         """Return open positions from gateway and update cache, merging TP/SL from open orders when available."""
+        # Single-flight: callers arriving while a refresh is running share its result instead of
+        # issuing another gateway round-trip. Shielded so one cancelled caller does not abort it for all.
+        # Internal callers that act on a position (close/modify/resync) use _load_positions directly so
+        # they never join a refresh that started before the fill or target change they depend on.
+        inflight = self._positions_inflight
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._load_positions())
+            self._positions_inflight = inflight
+            inflight.add_done_callback(self._clear_positions_inflight)
+        return await asyncio.shield(inflight)
+
+    def _clear_positions_inflight(self, task: asyncio.Future[list[Dict[str, Any]]]) -> None:
+        if self._positions_inflight is task:
+            self._positions_inflight = None
+        # Every waiter may have been cancelled behind the shield; retrieve the error so asyncio does not
+        # log "Task exception was never retrieved".
+        if not task.cancelled():
+            task.exception()
+
+    async def _load_positions(self) -> list[Dict[str, Any]]:
         positions_raw = await self.gateway.get_open_positions(force_rest=False, publish=True)
         if not positions_raw:
             positions_raw = await self.gateway.get_open_positions(force_rest=True, publish=True)
@@ -835,8 +939,7 @@ class OrderManager:
 
         # If positions exist but TP/SL map is missing, do a bounded account-orders backfill once
         # to avoid "blank until hard refresh" on initial load.
-        venue = (getattr(self.gateway, "venue", "") or "").lower()
-        if venue in {"apex", "hyperliquid"} and self.positions:
+        if self._venue_needs_tpsl_backfill and self.positions:
             needs_backfill = False
             for pos in self.positions:
                 symbol = self._normalize_symbol_value(pos.get("symbol"))
@@ -844,7 +947,7 @@ class OrderManager:
                 if entry.get("take_profit") is None and entry.get("stop_loss") is None:
                     needs_backfill = True
                     break
-            now = time.time()
+            now = time.monotonic()
             if needs_backfill and (now - self._tpsl_backfill_last_ts) >= self._tpsl_backfill_min_gap_seconds:
                 self._tpsl_backfill_last_ts = now
                 try:
@@ -860,12 +963,19 @@ class OrderManager:
         self._rebuild_open_risk_estimates(open_orders=self.open_orders, positions=self.positions)
         return self.positions
 
+    @staticmethod
+    def _find_position(positions: list[Dict[str, Any]], position_id: str) -> Optional[Dict[str, Any]]:
+        wanted = str(position_id)
+        for pos in positions:
+            if str(pos.get("id")) == wanted:
+                return pos
+        return None
+
     async def close_position(
         self, *, position_id: str, close_percent: float, close_type: str, limit_price: Optional[float] = None
     ) -> Dict[str, Any]:
         """Close a portion of a position via reduce-only order."""
-        positions = await self.list_positions()
-        target = next((p for p in positions if str(p.get("id")) == str(position_id)), None)
+        target = self._find_position(await self._load_positions(), position_id)
         if not target:
             raise ValueError(f"Position {position_id} not found")
         size_raw = target.get("size")
@@ -876,6 +986,7 @@ class OrderManager:
         close_size = size_val * (close_percent / 100.0)
         if close_size <= 0:
             raise ValueError("close_percent must be greater than 0")
+        close_kind = close_type.lower() if isinstance(close_type, str) else ""
         # logger.info(
         #     "close_position_request",
         #     extra={
@@ -922,7 +1033,7 @@ class OrderManager:
                     "position_id": position_id,
                     "symbol": target.get("symbol"),
                     "close_percent": close_percent,
-                    "close_type": (close_type or "").lower(),
+                    "close_type": close_kind,
                     "limit_price": limit_price,
                     "response": raw,
                 },
@@ -944,7 +1055,7 @@ class OrderManager:
         #         "client_id": client_id,
         #     },
         # )
-        if isinstance(close_type, str) and close_type.lower() == "limit":
+        if close_kind == "limit":
             try:
                 await self.gateway.get_open_orders(force_rest=True, publish=True)
             except Exception:
@@ -993,8 +1104,7 @@ class OrderManager:
         #     },
         # )
 
-        positions = await self.list_positions()
-        target = next((p for p in positions if str(p.get("id")) == str(position_id)), None)
+        target = self._find_position(await self._load_positions(), position_id)
         if not target:
             raise ValueError(f"Position {position_id} not found")
         symbol = target.get("symbol") or ""
@@ -1090,6 +1200,12 @@ class OrderManager:
 
         return response
 
+    async def _mark_price_or_none(self, symbol: str) -> Optional[float]:
+        try:
+            return await self.gateway.get_mark_price(symbol)
+        except Exception:
+            return None
+
     async def _enrich_positions(
         self, positions_raw: list[Dict[str, Any]], tpsl_map: Optional[Dict[str, Dict[str, float]]] = None
     ) -> list[Dict[str, Any]]:
@@ -1102,12 +1218,10 @@ class OrderManager:
                 normalized.append(norm)
                 if norm.get("symbol"):
                     symbols.add(norm["symbol"])
-        mark_cache: Dict[str, float] = {}
-        for sym in symbols:
-            try:
-                mark_cache[sym] = await self.gateway.get_mark_price(sym)
-            except Exception:
-                continue
+        # Mark prices are independent lookups; fetch them concurrently instead of one round-trip each.
+        symbols_list = list(symbols)
+        marks = await asyncio.gather(*(self._mark_price_or_none(sym) for sym in symbols_list))
+        mark_cache: Dict[str, Optional[float]] = dict(zip(symbols_list, marks))
         for pos in normalized:
             symbol = pos.get("symbol")
             mark = mark_cache.get(symbol)
@@ -1127,8 +1241,9 @@ class OrderManager:
     async def cancel_order(self, order_id: str) -> Dict[str, Any]:
         """Cancel an order and refresh cached state."""
         client_id = None
+        wanted = str(order_id)
         for order in self.open_orders:
-            if str(order.get("id")) == str(order_id):
+            if str(order.get("id")) == wanted:
                 client_id = order.get("client_id")
                 break
         result = await self.gateway.cancel_order(order_id, client_id=client_id)
@@ -1151,15 +1266,6 @@ class OrderManager:
 
     def _normalize_order(self, order: Dict[str, Any]) -> Dict[str, Any]:
         """Return a consistent shape for UI/API consumption."""
-
-        def _coerce_float(value: Any) -> Optional[float]:
-            try:
-                if value is None:
-                    return None
-                return float(value)
-            except Exception:
-                return None
-
         oid = (
             order.get("orderId")
             or order.get("order_id")
@@ -1168,7 +1274,8 @@ class OrderManager:
             or order.get("id")
             or ""
         )
-        size_val = _coerce_float(order.get("size") or order.get("qty") or order.get("quantity"))
+        size_raw = order.get("size") or order.get("qty") or order.get("quantity")
+        size_val = _coerce_float(size_raw)
         price_val = _coerce_float(
             order.get("price")
             or order.get("avgPrice")
@@ -1182,7 +1289,7 @@ class OrderManager:
             "id": str(oid),
             "symbol": order.get("symbol") or order.get("market"),
             "side": (order.get("side") or order.get("positionSide") or order.get("direction") or "").upper(),
-            "size": size_val if size_val is not None else order.get("size") or order.get("qty") or order.get("quantity"),
+            "size": size_val if size_val is not None else size_raw,
             "status": order.get("status") or order.get("state") or order.get("orderStatus"),
             "entry_price": price_val,
         }
@@ -1201,24 +1308,19 @@ class OrderManager:
     def _extract_tpsl_from_orders(self, orders: list[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
         """Build a symbol->tp/sl map from TP/SL orders (reduce-only or position TP/SL)."""
 
-        def _first_number(values: list[Any]) -> Optional[float]:
-            for val in values:
-                if val is None:
-                    continue
-                if isinstance(val, (int, float)):
-                    return float(val)
-                if isinstance(val, str):
-                    try:
-                        return float(val)
-                    except Exception:
-                        continue
-            return None
-
         tpsl: Dict[str, Dict[str, Any]] = {}
         tpsl_meta: Dict[str, Dict[str, int]] = {}
         debug_counts = {"total": 0, "position_tpsl": 0, "tp": 0, "sl": 0, "skipped_status": 0, "skipped_trigger": 0}
 
+        price_hints: Dict[str, Optional[float]] = {}
+
         def _price_hint_for_symbol(symbol: str) -> Optional[float]:
+            # Market price does not move within one extraction pass; probe once per symbol.
+            if symbol not in price_hints:
+                price_hints[symbol] = _lookup_price_hint(symbol)
+            return price_hints[symbol]
+
+        def _lookup_price_hint(symbol: str) -> Optional[float]:
             gateway = self.gateway
             try:
                 ticker_cache = getattr(gateway, "_ticker_cache", None)
@@ -1267,7 +1369,7 @@ class OrderManager:
             if not isinstance(order, dict):
                 continue
             status_raw = str(order.get("status") or order.get("orderStatus") or "").lower()
-            if status_raw in {"canceled", "cancelled", "filled", "triggered"} or "cancel" in status_raw:
+            if status_raw in self._TPSL_CLOSED_STATUSES or "cancel" in status_raw:
                 debug_counts["skipped_status"] += 1
                 continue
             symbol = self._normalize_symbol_value(order.get("symbol") or order.get("market"))
@@ -1279,29 +1381,8 @@ class OrderManager:
                 continue
             debug_counts["position_tpsl"] += 1
 
-            tp_candidates = [
-                order.get("tpTriggerPrice"),
-                order.get("tpPrice"),
-                order.get("openTpParam"),
-                order.get("takeProfitPrice"),
-                order.get("takeProfit"),
-                order.get("tp"),
-                order.get("triggerPrice") if order_type.startswith("TAKE_PROFIT") else None,
-                (order.get("openTpParams") or {}).get("triggerPrice"),
-            ]
-            sl_candidates = [
-                order.get("slTriggerPrice"),
-                order.get("slPrice"),
-                order.get("openSlParam"),
-                order.get("stopLossPrice"),
-                order.get("stopLoss"),
-                order.get("sl"),
-                order.get("triggerPrice") if order_type.startswith("STOP") else None,
-                (order.get("openSlParams") or {}).get("triggerPrice"),
-            ]
-
-            tp_val = _first_number(tp_candidates)
-            sl_val = _first_number(sl_candidates)
+            tp_val = _order_trigger_price(order, _TP_PRICE_KEYS, order_type.startswith("TAKE_PROFIT"), "openTpParams")
+            sl_val = _order_trigger_price(order, _SL_PRICE_KEYS, order_type.startswith("STOP"), "openSlParams")
             if tp_val is None and sl_val is None:
                 debug_counts["skipped_trigger"] += 1
             if "TAKE_PROFIT" in order_type or tp_val is not None:
@@ -1355,14 +1436,6 @@ class OrderManager:
         """Return a consistent shape for UI/API consumption."""
         raw_size = position.get("size") or position.get("positionSize")
 
-        def _coerce_float(value: Any) -> Optional[float]:
-            try:
-                if value is None:
-                    return None
-                return float(value)
-            except Exception:
-                return None
-
         size_val = _coerce_float(raw_size)
         if size_val is not None and size_val <= 0:
             return None
@@ -1520,5 +1593,5 @@ class OrderManager:
                 extra={"event": "tpsl_resync_reconcile_failed", "error": str(exc)},
             )
             return False
-        await self.list_positions()
+        await self._load_positions()
         return True
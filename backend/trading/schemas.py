@@ -1,9 +1,11 @@
 from typing import Literal, Optional
 
-from pydantic import BaseModel, Field, model_validator, validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator, model_validator
 
 
 class TradeRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     symbol: str
     entry_price: float = Field(..., gt=0)
     stop_price: float = Field(..., gt=0)
@@ -13,7 +15,8 @@ class TradeRequest(BaseModel):
     preview: bool = True
     execute: bool = False
 
-    @validator("side")
+    @field_validator("side")
+    @classmethod
     def validate_side(cls, value: Optional[str]) -> Optional[str]:
         if value is None:
             return value
@@ -101,13 +104,15 @@ class ClosePositionRequest(BaseModel):
     close_type: str = Field(..., pattern="^(market|limit)$")
     limit_price: Optional[float] = Field(None, gt=0)
 
-    @validator("close_type")
+    @field_validator("close_type")
+    @classmethod
     def validate_close_type(cls, value: str) -> str:
         return value.lower()
 
-    @validator("limit_price")
-    def validate_limit_price(cls, value: Optional[float], values):
-        close_type = values.get("close_type")
+    @field_validator("limit_price")
+    @classmethod
+    def validate_limit_price(cls, value: Optional[float], info: ValidationInfo):
+        close_type = info.data.get("close_type")
         if close_type == "limit" and value is None:
             raise ValueError("limit_price is required for limit close")
         return value
@@ -120,15 +125,15 @@ class TargetsUpdateRequest(BaseModel):
     clear_sl: Optional[bool] = False
 
     @model_validator(mode="after")
-    def ensure_at_least_one(cls, values: "TargetsUpdateRequest"):
+    def ensure_at_least_one(self) -> "TargetsUpdateRequest":
         if (
-            values.take_profit is None
-            and values.stop_loss is None
-            and not values.clear_tp
-            and not values.clear_sl
+            self.take_profit is None
+            and self.stop_loss is None
+            and not self.clear_tp
+            and not self.clear_sl
         ):
             raise ValueError("At least one of take_profit, stop_loss, clear_tp, or clear_sl must be provided")
-        return values
+        return self
 
 
 class ErrorResponse(BaseModel):
@@ -146,18 +151,22 @@ class VenueSwitchRequest(BaseModel):
 
 
 class AtrStopRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     symbol: str = Field(..., pattern=r"^[A-Z0-9]+-[A-Z0-9]+$")
     side: Literal["long", "short"]
     entry_price: float = Field(..., gt=0)
     timeframe: Optional[str] = None
 
-    @validator("symbol", pre=True)
+    @field_validator("symbol", mode="before")
+    @classmethod
     def normalize_symbol(cls, value: str) -> str:
         if not value:
             raise ValueError("symbol is required")
         return value.strip().upper()
 
-    @validator("side", pre=True)
+    @field_validator("side", mode="before")
+    @classmethod
     def normalize_side(cls, value: str) -> str:
         if not value:
             raise ValueError("side is required")
@@ -169,7 +178,8 @@ class AtrStopRequest(BaseModel):
                 raise ValueError("side must be 'long' or 'short'")
         return normalized
 
-    @validator("timeframe", pre=True)
+    @field_validator("timeframe", mode="before")
+    @classmethod
     def normalize_timeframe(cls, value: Optional[str]) -> Optional[str]:
         if value is None:
             return None